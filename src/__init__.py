@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from .auth.routes import auth_router
 from .daily_challenge.routes import daily_challenge_router
 from .leaderboard.routes import leaderboard_router
@@ -6,16 +7,18 @@ from .tasks.routes import task_router
 from .team.routes import team_router
 from .workroom.routes import workroom_router
 from .middleware import register_middleware
+from .errors import register_error_handlers
 from contextlib import asynccontextmanager
+import asyncio
 from src.db.main import init_db
-from src.db.mongo import initialize_mongo
+from src.db.mongo import initialize_mongo, close_mongo
 
 @asynccontextmanager 
 async def life_span(app:FastAPI):
     print(f"Server is starting...")
-    await init_db()
-    await initialize_mongo()
+    await asyncio.gather(init_db(), initialize_mongo())
     yield
+    await close_mongo()
     print(f"Server has been stopped")
 
 version = "v1"
@@ -28,12 +31,14 @@ app = FastAPI(
     description = "Let's make working fun 🤪😉",
     version= version,
     lifespan= life_span,
+    default_response_class=ORJSONResponse,
     openapi_url=f"{version_prefix}/openapi.json",
     docs_url=f"{version_prefix}/docs",
     redoc_url=f"{version_prefix}/redoc"
 )
 
 register_middleware(app)
+register_error_handlers(app)
 
 
 app.include_router(auth_router, prefix=f"/api/{version}/auth", tags=['auth'])
@@ -7,11 +7,16 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from src.db.mongo import token_in_blocklist
 from src.db.main import get_session
 from .service import UserService
-from typing import Any, List
+from typing import Any, Callable, List, Tuple
+from collections import OrderedDict
 from src.db.models import User
+from uuid import UUID
+import logging
+import time
 
 
 user_service = UserService()
+logger = logging.getLogger(__name__)
 
 
 class TokenBearer(HTTPBearer):
@@ -22,17 +27,13 @@ class TokenBearer(HTTPBearer):
         creds = await super().__call__(request)
         token = creds.credentials
         token_data = decode_token(token)
-        if not self.token_valid(token):
+        if token_data is None:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or Expired Token")
         if await token_in_blocklist(token_data["jti"]):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or Expired Token")
         self.verify_token_data(token_data)
         return token_data
     
-    def token_valid(self, token: str) -> bool:
-        token_data = decode_token(token)
-        return token_data is not None
-    
     def verify_token_data(self, token_data):
         raise NotImplementedError("Please Override this method in child classes")
             
@@ -51,10 +52,12 @@ async def get_current_user(
     token_details: dict = Depends(AccessTokenBearer()),
     session: AsyncSession = Depends(get_session),
 ):
-    print(token_details)
-    user_email = token_details["user"]["email"]
+    logger.debug("Token details: %s", token_details)
+    user_uid = UUID(token_details["user"]["user_uid"])
 
-    user = await user_service.get_user_by_email(user_email, session)
+    user = await user_service.get_user_by_id(user_uid, session)
+    if user is None or user.token_version != token_details["user"].get("token_version", 0):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or Expired Token")
 
     return user
 
@@ -69,4 +72,39 @@ class RoleChecker:
         if current_user.role in self.allowed_roles:
             return True
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, 
-                            detail="You do not have enough permissions to perform this action")
\ No newline at end of file
+                            detail="You do not have enough permissions to perform this action")
+
+
+def client_host(request: Request) -> str:
+    # Behind a load balancer or NAT this is the proxy's address unless uvicorn
+    # runs with --proxy-headers and --forwarded-allow-ips=<proxy address>, in
+    # which case it is the client address taken from X-Forwarded-For.
+    return request.client.host if request.client else "unknown"
+
+
+class RateLimiter:
+    def __init__(self, limit: int, window: int, max_clients: int = 10_000,
+                 key_func: Callable[[Request], str] = client_host) -> None:
+        self.limit = limit
+        self.window = window
+        self.max_clients = max_clients
+        self.key_func = key_func
+        # Least recently seen clients first; the oldest is dropped once the
+        # table holds max_clients entries.
+        self.hits: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+        
+    async def __call__(self, request: Request) -> None:
+        now = time.monotonic()
+        key = f"{request.url.path}:{self.key_func(request)}"
+        
+        window_start, count = self.hits.get(key, (now, 0))
+        if now - window_start >= self.window:
+            window_start, count = now, 0
+        self.hits[key] = (window_start, count + 1)
+        self.hits.move_to_end(key)
+        if len(self.hits) > self.max_clients:
+            self.hits.popitem(last=False)
+        
+        if count >= self.limit:
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                                detail="Too many requests, please try again later")
@@ -1,36 +1,54 @@
 from src.mail import mail, create_message
 from fastapi import APIRouter, Depends, status, BackgroundTasks
 from fastapi.exceptions import HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from src.db.models import User
 from .schema import (PasswordResetConfirmModel, GoogleUserLogin,PasswordResetRequestModel, 
-                     UserCreateModel, UserLoginModel, EmailModel, UserUpdateModel)
+                     UserCreateModel, UserLoginModel, EmailModel, UserUpdateModel, UserModel)
 from .service import UserService
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select
 from src.db.main import get_session
 from firebase_admin import auth
 import firebase_admin
-from .utils import create_access_tokens, create_url_safe_token, decode_url_safe_token, verify_password, generate_password_hash
-from datetime import timedelta, datetime
-from .dependencies import RefreshTokenBearer, AccessTokenBearer, get_current_user, RoleChecker
+import asyncio
+from .utils import create_access_tokens, create_url_safe_token, decode_url_safe_token, verify_password, generate_password_hash, DUMMY_PASSWORD_HASH, UNUSABLE_PASSWORD_HASH
+from datetime import timedelta
+import time
+from uuid import UUID
+from .dependencies import RefreshTokenBearer, AccessTokenBearer, get_current_user, RoleChecker, RateLimiter
 from src.db.mongo import add_jti_to_blocklist
 from src.config import Config
 
 auth_router = APIRouter() 
 user_service = UserService()
 role_checker = RoleChecker(["admin", "user"])
+signup_rate_limiter = RateLimiter(limit=5, window=60)
+login_rate_limiter = RateLimiter(limit=10, window=60)
+password_reset_rate_limiter = RateLimiter(limit=5, window=60)
 
 cred = firebase_admin.credentials.Certificate("hudddle-project-firebase.json")
 firebase_admin.initialize_app(cred)
 
 REFRESH_TOKEN_EXPIRY = 2
 
+VERIFY_EMAIL_TEMPLATE = """
+    <h1>Verify your Email</h1>
+    <p>Please click this <a href="{link}">link</a> to verify your email</p>
+    """
+
+PASSWORD_RESET_TEMPLATE = """
+    <h1>Reset Your Password</h1>
+    <p>Please click this <a href="{link}">link</a> to Reset Your Password</p>
+    """
+
+WELCOME_TEMPLATE = "<h1>Welcome to the app</h1>"
+
 
 @auth_router.post("/signup", status_code=status.HTTP_201_CREATED)
 async def create_user_account(user_data: UserCreateModel,
                               bg_tasks: BackgroundTasks,
-                              session: AsyncSession = Depends(get_session)):
+                              session: AsyncSession = Depends(get_session),
+                              _: None = Depends(signup_rate_limiter)):
     email = user_data.email
     user_exists = await user_service.user_exists(email, session)
     if user_exists:
@@ -41,10 +59,7 @@ async def create_user_account(user_data: UserCreateModel,
 
     link = f"http://{Config.DOMAIN}/api/v1/auth/verify/{token}"
 
-    html = f"""
-    <h1>Verify your Email</h1>
-    <p>Please click this <a href="{link}">link</a> to verify your email</p>
-    """
+    html = VERIFY_EMAIL_TEMPLATE.format(link=link)
 
     emails = [email]
 
@@ -60,14 +75,14 @@ async def create_user_account(user_data: UserCreateModel,
 
     return {
         "message": "Account Created! Check email to verify your account",
-        "user": new_user,
+        "user": UserModel.model_validate(new_user),
     }
 
 @auth_router.post("/google_login")
 async def google_login(user: GoogleUserLogin, session: AsyncSession = Depends(get_session)):
     try:
         # 1. Verify the Google ID token (sent by the client)
-        decoded_token = auth.verify_id_token(user.id_token)
+        decoded_token = await asyncio.to_thread(auth.verify_id_token, user.id_token)
         uid = decoded_token["uid"]
         email = decoded_token.get("email") # Email might not always be present
 
@@ -93,37 +108,40 @@ async def google_login(user: GoogleUserLogin, session: AsyncSession = Depends(ge
                 "first_name": first_name,
                 "last_name": last_name,
                 "is_verified": True,
-                "password_hash": generate_password_hash("default_password"),
+                "password_hash": UNUSABLE_PASSWORD_HASH,
                 "badges": [],
                 "avatar_url": decoded_token.get("picture")
             }
-            db_user = await user_service.create_user(user_data, session)
+            db_user = await user_service.create_firebase_user(user_data, session)
         
         # 4. Generate your application's access and refresh tokens
+        user_uid = str(db_user.id)
         access_token = create_access_tokens(
             user_data={
                 "email": db_user.email,
-                "user_uid": str(db_user.id), # Assuming you have a standard uid in your db
-                "role": db_user.role # Get role from your DB
+                "user_uid": user_uid, # Assuming you have a standard uid in your db
+                "role": db_user.role, # Get role from your DB
+                "token_version": db_user.token_version
             }
         )
         refresh_token = create_access_tokens(
             user_data={
                 "email": db_user.email,
-                "user_uid": str(db_user.id)
+                "user_uid": user_uid,
+                "token_version": db_user.token_version
             },
             refresh=True,
             expiry=timedelta(days=REFRESH_TOKEN_EXPIRY)
         )
 
-        return JSONResponse(
+        return ORJSONResponse(
             content={
                 "message": "Login Successful",
                 "access token": access_token,
                 "refresh token": refresh_token,
                 "user": {
                     "email": db_user.email,
-                    "uid": str(db_user.id),
+                    "uid": user_uid,
                     "username": db_user.username
                 }
             }
@@ -131,14 +149,12 @@ async def google_login(user: GoogleUserLogin, session: AsyncSession = Depends(ge
 
     except auth.InvalidIdTokenError as e:
         raise HTTPException(status_code=400, detail="Invalid ID token")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
 
 @auth_router.post("/google_verify")
 async def verify_token(token: str):
     try:
         # Verify the Firebase ID token
-        decoded_token = auth.verify_id_token(token)
+        decoded_token = await asyncio.to_thread(auth.verify_id_token, token)
         uid = decoded_token["uid"]
         email = decoded_token["email"]
 
@@ -148,39 +164,43 @@ async def verify_token(token: str):
 
 @auth_router.post("/login", status_code=status.HTTP_200_OK)
 async def login_user(user_login_data: UserLoginModel,
-                              session: AsyncSession = Depends(get_session)):
+                              session: AsyncSession = Depends(get_session),
+                              _: None = Depends(login_rate_limiter)):
     email = user_login_data.email
     password = user_login_data.password
     
     user = await user_service.get_user_by_email(email, session)
+    password_hash = user.password_hash if user is not None else DUMMY_PASSWORD_HASH
+    password_valid = await verify_password(password, password_hash)
     if user is not None:
-        password_valid = verify_password(password, user.password_hash)
-        
         if password_valid:
+            user_uid = str(user.id)
             access_token = create_access_tokens(
                 user_data={
                     "email": user.email,
-                    "user_uid": str(user.id),
-                    "role": user.role
+                    "user_uid": user_uid,
+                    "role": user.role,
+                    "token_version": user.token_version
                 }
             )
             
             refresh_token = create_access_tokens(
                 user_data={
                     "email": user.email,
-                    "user_uid": str(user.id)
+                    "user_uid": user_uid,
+                    "token_version": user.token_version
                 },
                 refresh=True,
                 expiry=timedelta(days=REFRESH_TOKEN_EXPIRY)
             )
-            return JSONResponse(
+            return ORJSONResponse(
                 content={
                     "message": "Login Successfull",
                     "access token": access_token,
                     "refresh token": refresh_token,
                     "user": {
                         "email": user.email,
-                        "uid": str(user.id),
+                        "uid": user_uid,
                         "username": user.username
                     }
                 }
@@ -198,76 +218,73 @@ async def verify_user_account(token: str, session: AsyncSession = Depends(get_se
     user_email = token_data.get("email")
 
     if user_email:
-        user = await user_service.get_user_by_email(user_email, session)
+        user_updated = await user_service.update_user_by_email(user_email, {"is_verified": True}, session)
 
-        if not user:
+        if not user_updated:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-        await user_service.update_user(user, {"is_verified": True}, session)
-
-        return JSONResponse(
+        return ORJSONResponse(
             content={"message": "Account verified successfully"},
             status_code=status.HTTP_200_OK,
         )
 
-    return JSONResponse(
+    return ORJSONResponse(
         content={"message": "Error occured during verification"},
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
     )
 
 @auth_router.get("/refresh_token")
-async def get_new_access_token(token_details:dict = Depends(RefreshTokenBearer())):
-    try:
-        expiry_timestamp = token_details['exp']
-        if datetime.fromtimestamp(expiry_timestamp) > datetime.now():
-            new_access_token = create_access_tokens(
-                user_data=token_details['user']
-            )
-            return JSONResponse(content={
-                "access_token": new_access_token
-            })
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or Expired Token"
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+async def get_new_access_token(token_details:dict = Depends(RefreshTokenBearer()),
+                               session: AsyncSession = Depends(get_session)):
+    user = await user_service.get_user_by_id(UUID(token_details['user']['user_uid']), session)
+    if user is None or user.token_version != token_details['user'].get('token_version', 0):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or Expired Token")
+
+    expiry_timestamp = token_details['exp']
+    if expiry_timestamp > time.time():
+        new_access_token = create_access_tokens(
+            user_data={
+                "email": user.email,
+                "user_uid": str(user.id),
+                "role": user.role,
+                "token_version": user.token_version
+            }
         )
+        return ORJSONResponse(content={
+            "access_token": new_access_token
+        })
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid or Expired Token"
+    )
 
 @auth_router.get("/logout")
 async def revoke_token(token_details: dict = Depends(AccessTokenBearer())):
     jti = token_details["jti"]
     await add_jti_to_blocklist(jti)
     
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "message": "Logged out Successfully"
         },
         status_code=status.HTTP_200_OK
     )
     
-@auth_router.get("/me", response_model=User)
-async def get_current_user(user = Depends(get_current_user), 
-                           _: bool = Depends(role_checker),
-                           session: AsyncSession = Depends(get_session)):
-    statement = select(User).where(User.id == user.id).options()
-    result = await session.exec(statement)
-    user = result.first()
-
+@auth_router.get("/me", response_model=UserModel)
+async def get_current_user_details(user = Depends(get_current_user), 
+                                   _: bool = Depends(role_checker)):
     return user
     
 @auth_router.post("/password-reset-request")
-async def password_reset_request(email_data: PasswordResetRequestModel):
+async def password_reset_request(email_data: PasswordResetRequestModel,
+                                 bg_tasks: BackgroundTasks,
+                                 _: None = Depends(password_reset_rate_limiter)):
     email = email_data.email
 
     token = create_url_safe_token({"email": email})
 
     link = f"http://{Config.DOMAIN}/api/v1/auth/password-reset-confirm/{token}"
 
-    html_message = f"""
-    <h1>Reset Your Password</h1>
-    <p>Please click this <a href="{link}">link</a> to Reset Your Password</p>
-    """
+    html_message = PASSWORD_RESET_TEMPLATE.format(link=link)
     subject = "Reset Your Password"
 
     # send_email.delay([email], subject, html_message)
@@ -278,9 +295,9 @@ async def password_reset_request(email_data: PasswordResetRequestModel):
         body=html_message
     )
     
-    await mail.send_message(message)
+    bg_tasks.add_task(mail.send_message, message)
     
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "message": "Please check your email for instructions to reset your password",
         },
@@ -306,20 +323,23 @@ async def reset_account_password(
     user_email = token_data.get("email")
 
     if user_email:
-        user = await user_service.get_user_by_email(user_email, session)
+        passwd_hash = await generate_password_hash(new_password)
+        # Bumping the version invalidates every token issued before the reset.
+        user_updated = await user_service.update_user_by_email(
+            user_email,
+            {"password_hash": passwd_hash, "token_version": User.token_version + 1},
+            session
+        )
 
-        if not user:
+        if not user_updated:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-        passwd_hash = generate_password_hash(new_password)
-        await user_service.update_user(user, {"password_hash": passwd_hash}, session)
-
-        return JSONResponse(
+        return ORJSONResponse(
             content={"message": "Password reset Successfully"},
             status_code=status.HTTP_200_OK,
         )
 
-    return JSONResponse(
+    return ORJSONResponse(
         content={"message": "Error occured during password reset."},
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
     )
@@ -329,27 +349,26 @@ async def send_mail(emails: EmailModel,
                     bg_tasks: BackgroundTasks):
     emails = emails.addresses
 
-    html = "<h1>Welcome to the app</h1>"
     subject = "Welcome to our app"
     
     message = create_message(
         recipients=emails,
         subject=subject,
-        body=html
+        body=WELCOME_TEMPLATE
     )
     
     bg_tasks.add_task(mail.send_message, message)
 
     return {"message": "Email sent successfully"}
 
-@auth_router.put("/update-profile", response_model=User)
+@auth_router.put("/update-profile", response_model=UserModel)
 async def update_user_profile(
     update_data: UserUpdateModel,
     user: User = Depends(get_current_user),
     _: bool = Depends(role_checker),
     session: AsyncSession = Depends(get_session),
 ):
-    update_dict = update_data.dict(exclude_unset=True)
+    update_dict = update_data.model_dump(exclude_unset=True)
 
     updated_user = await user_service.update_user(user, update_dict, session)
     return updated_user
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field, EmailStr, validator
+from pydantic import BaseModel, Field, EmailStr, field_validator, ConfigDict
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from uuid import UUID
 
 # User Creation Schema
 class UserCreateModel(BaseModel):
@@ -19,19 +20,45 @@ class UserUpdateModel(BaseModel):
     productivity: Optional[float] = None 
     average_task_time: Optional[float] = None
     
-    @validator("productivity")
+    @field_validator("productivity")
+    @classmethod
     def productivity_must_be_between_0_and_1(cls, value):
         if value is not None and (value < 0.0 or value > 1.0):
             raise ValueError("Productivity must be between 0.0 and 1.0")
         return value
 
-    @validator("average_task_time")
+    @field_validator("average_task_time")
+    @classmethod
     def average_task_time_must_be_non_negative(cls, value):
         if value is not None and value < 0.0:
             raise ValueError("Average task time must be non-negative")
         return value
 
 
+# User Response Schema
+class UserModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    email: str
+    username: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    role: str
+    xp: int
+    level: int
+    badges: Optional[List[str]] = None
+    avatar_url: Optional[str] = None
+    is_verified: bool
+    productivity: float
+    average_task_time: float
+    user_type: Optional[str] = None
+    find_us: Optional[str] = None
+    software_used: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
 # User Login Schema
 class UserLoginModel(BaseModel):
     email: EmailStr = Field(max_length=40, description="Email address of the user")
@@ -3,9 +3,19 @@ from fastapi.exceptions import HTTPException
 from fastapi import status
 from src.db.models import User
 from typing import Dict, Any
+from uuid import UUID
 from .schema import UserCreateModel
 from sqlmodel import select
+from sqlalchemy import bindparam, update
 from .utils import generate_password_hash
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+user_by_firebase_uid_statement = select(User).where(User.firebase_uid == bindparam("firebase_uid"))
+user_by_email_statement = select(User).where(User.email == bindparam("email"))
+user_id_by_email_statement = select(User.id).where(User.email == bindparam("email"))
 
 
 class UserService:
@@ -13,36 +23,45 @@ class UserService:
     async def get_user_by_firebase_uid(self, firebase_uid: str, session: AsyncSession):
         """Retrieves a user by their Firebase UID."""
         try:
-            statement = select(User).where(User.firebase_uid == firebase_uid)
-            result = await session.exec(statement)
+            result = await session.exec(user_by_firebase_uid_statement, params={"firebase_uid": firebase_uid})
             user = result.first()
             return user
         except Exception as e:
-            print(f"Error getting user by Firebase UID: {e}")
+            logger.error("Error getting user by Firebase UID: %s", e)
             return None
     
     async def get_user_by_email(self, email: str, session: AsyncSession):
-        statement = select(User).where(User.email == email)
-        result = await session.exec(statement)
+        result = await session.exec(user_by_email_statement, params={"email": email})
         
         user_object = result.first()
         return user_object
+    
+    async def get_user_by_id(self, user_id: UUID, session: AsyncSession):
+        return await session.get(User, user_id)
  
     async def user_exists(self, email, session: AsyncSession):
-        user_object = await self.get_user_by_email(email, session)
+        result = await session.exec(user_id_by_email_statement, params={"email": email})
         
-        return user_object is not None
+        return result.first() is not None
              
     async def create_user(self, user_data: UserCreateModel, session: AsyncSession):
         user_data_dict = user_data.model_dump()
         new_user = User(**user_data_dict)
-        new_user.password_hash = generate_password_hash(user_data_dict["password"])
+        new_user.password_hash = await generate_password_hash(user_data_dict["password"])
         new_user.role = "user"
         session.add(new_user) 
         await session.commit()
         
         return new_user
         
+    async def create_firebase_user(self, user_data: dict, session: AsyncSession):
+        new_user = User(**user_data)
+        new_user.role = "user"
+        session.add(new_user)
+        await session.commit()
+        
+        return new_user
+        
     async def update_user(self, user:User , user_data: dict,session:AsyncSession):
 
         for k, v in user_data.items():
@@ -51,5 +70,12 @@ class UserService:
         await session.commit()
 
         return user
+
+    async def update_user_by_email(self, email: str, user_data: dict, session: AsyncSession) -> bool:
+        statement = update(User).where(User.email == email).values(**user_data)
+        result = await session.exec(statement)
+        await session.commit()
+
+        return result.rowcount > 0
     
     
\ No newline at end of file
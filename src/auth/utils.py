@@ -1,14 +1,30 @@
-from datetime import datetime, timedelta
-from passlib.context import CryptContext
+from datetime import timedelta
 from src.config import Config
 import logging
 import jwt
-import uuid
+import secrets
 from itsdangerous import URLSafeTimedSerializer
+from src.cache import TTLCache
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+import hashlib
+import hmac
+import base64
+import orjson
+import time
 
 
-password_context = CryptContext(
-    schemes=["bcrypt"]
+BCRYPT_ROUNDS = 12
+# bcrypt only uses the first 72 bytes of a password; newer releases of the
+# library raise instead of truncating, so truncate explicitly as passlib did.
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
+# bcrypt runs on its own small pool so a burst of logins cannot take every
+# thread from the default executor that other blocking calls share.
+password_executor = ThreadPoolExecutor(
+    max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="bcrypt"
 )
 
 serializer = URLSafeTimedSerializer(
@@ -17,41 +33,97 @@ serializer = URLSafeTimedSerializer(
 
 ACCESS_TOKEN_EXPIRY = 3600
 
-def generate_password_hash(password: str) -> str:
-    hash = password_context.hash(password)
+DUMMY_PASSWORD_HASH = bcrypt.hashpw(
+    b"hudddle-dummy-password", bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+).decode("utf-8")
+
+# Stored for accounts that sign in through Google only. It is not a bcrypt
+# hash, so no password can ever verify against it.
+UNUSABLE_PASSWORD_HASH = "!google"
+
+JWT_KEY = Config.JWT_SECRET_KEY.encode("utf-8")
+JWT_ALGORITHM = Config.JWT_ALGORITHM
+JWT_ALGORITHMS = [JWT_ALGORITHM]
+JWT_DECODE_OPTIONS = {"require": ["exp", "jti", "user", "refresh"]}
+
+# HMAC algorithms are signed here directly; anything else goes through PyJWT.
+JWT_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+JWT_DIGEST = JWT_HMAC_DIGESTS.get(JWT_ALGORITHM)
+
+logger = logging.getLogger(__name__)
+
+TOKEN_CACHE_SIZE = 10_000
+TOKEN_CACHE_TTL = 60
+
+# Verified token payloads keyed by the SHA-256 of the token.
+token_cache = TTLCache(TOKEN_CACHE_SIZE)
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+# Same header bytes PyJWT emits: sorted keys, compact separators.
+JWT_HEADER_SEGMENT = _b64url(orjson.dumps({"alg": JWT_ALGORITHM, "typ": "JWT"}))
+
+def _encode_jwt(payload: dict) -> str:
+    if JWT_DIGEST is None:
+        return jwt.encode(payload=payload, key=JWT_KEY, algorithm=JWT_ALGORITHM)
+
+    signing_input = JWT_HEADER_SEGMENT + b"." + _b64url(orjson.dumps(payload))
+    signature = hmac.new(JWT_KEY, signing_input, JWT_DIGEST).digest()
+    return (signing_input + b"." + _b64url(signature)).decode("ascii")
+
+def _hash_password(password: str) -> str:
+    password_bytes = password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
+    return bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("utf-8")
+
+def _check_password(password: str, hash: str) -> bool:
+    password_bytes = password.encode("utf-8")[:BCRYPT_MAX_PASSWORD_BYTES]
+    return bcrypt.checkpw(password_bytes, hash.encode("utf-8"))
+
+async def generate_password_hash(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    hash = await loop.run_in_executor(password_executor, _hash_password, password)
     
     return hash
 
-def verify_password(password: str, hash: str) -> bool:
-    return password_context.verify(password, hash)
+async def verify_password(password: str, hash: str) -> bool:
+    loop = asyncio.get_running_loop()
+    if not hash.startswith("$2"):
+        await loop.run_in_executor(password_executor, _check_password, password, DUMMY_PASSWORD_HASH)
+        return False
+    return await loop.run_in_executor(password_executor, _check_password, password, hash)
 
 def create_access_tokens(user_data: dict, expiry: timedelta = None, refresh: bool= False):
     payload = {}
     payload["user"] = user_data
-    payload["exp"] = datetime.now() + (
-            expiry if expiry is not None else timedelta(seconds=ACCESS_TOKEN_EXPIRY)
+    payload["exp"] = int(time.time()) + (
+            int(expiry.total_seconds()) if expiry is not None else ACCESS_TOKEN_EXPIRY
         )
-    payload["jti"] = str(uuid.uuid4())
+    payload["jti"] = secrets.token_hex(16)
     payload["refresh"] = refresh
     
-    token = jwt.encode(
-        payload= payload,
-        key=Config.JWT_SECRET_KEY,
-        algorithm=Config.JWT_ALGORITHM
-    )
+    token = _encode_jwt(payload)
     return token
 
 def decode_token(token: str) -> dict:
+    cache_key = hashlib.sha256(token.encode()).digest()
+    token_data = token_cache.get(cache_key)
+    if token_data is not None:
+        return token_data
+
     try:
         token_data = jwt.decode(
             jwt=token,
-            key=Config.JWT_SECRET_KEY,
-            algorithms=[Config.JWT_ALGORITHM]
+            key=JWT_KEY,
+            algorithms=JWT_ALGORITHMS,
+            options=JWT_DECODE_OPTIONS
         )
-        return token_data
     except jwt.PyJWTError as e:
-        logging.exception(e)
+        logger.warning("Token verification failed: %s", e)
         return None
+
+    token_cache.set(cache_key, token_data, min(token_data["exp"], time.time() + TOKEN_CACHE_TTL))
+    return token_data
     
 def create_url_safe_token(data: dict):
 
@@ -66,5 +138,5 @@ def decode_url_safe_token(token:str):
         return token_data
     
     except Exception as e:
-        logging.error(str(e))
+        logger.warning("URL-safe token rejected: %s", e)
         
\ No newline at end of file
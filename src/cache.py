@@ -0,0 +1,34 @@
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+import time
+
+
+class TTLCache:
+    """Bounded LRU map whose entries each expire at their own epoch time."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        value, valid_until = entry
+        if time.time() < valid_until:
+            self.entries.move_to_end(key)
+            return value
+        del self.entries[key]
+        return None
+
+    def set(self, key: Hashable, value: Any, valid_until: float) -> None:
+        self.entries[key] = (value, valid_until)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self.entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -7,6 +7,11 @@ class Settings(BaseSettings):
     MONGO_CLUSTER: str
     MONGO_DB_NAME: str
     DATABASE_URL: str
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str
     MAIL_USERNAME: str
@@ -40,7 +40,7 @@ def update_challenge(challenge_id: UUID, challenge_update: DailyChallenge, sessi
         raise HTTPException(status_code=404, detail="Challenge not found")
     if challenge.created_by != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to update this challenge")
-    for key, value in challenge_update.dict().items():
+    for key, value in challenge_update.model_dump().items():
         setattr(challenge, key, value)
     session.commit()
     session.refresh(challenge)
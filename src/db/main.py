@@ -1,15 +1,23 @@
-from sqlmodel import create_engine, SQLModel
-from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import SQLModel
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy.orm import sessionmaker
 from src.config import Config
 
 
-async_engine = AsyncEngine(
-    create_engine(
-        url=Config.DATABASE_URL,
-        echo=True
-    )
+async_engine = create_async_engine(
+    url=Config.DATABASE_URL,
+    echo=Config.DB_ECHO,
+    pool_size=Config.DB_POOL_SIZE,
+    max_overflow=Config.DB_MAX_OVERFLOW,
+    pool_timeout=Config.DB_POOL_TIMEOUT,
+    pool_recycle=Config.DB_POOL_RECYCLE,
+    pool_pre_ping=True
+)
+
+Session = async_sessionmaker(
+    bind = async_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
 )
 
 async def init_db():
@@ -18,11 +26,5 @@ async def init_db():
         await conn.run_sync(SQLModel.metadata.create_all)
         
 async def get_session() -> AsyncSession:
-    Session = sessionmaker(
-        bind = async_engine,
-        class_=AsyncSession,
-        expire_on_commit=False
-    )
-    
     async with Session() as session:
-        yield session
\ No newline at end of file
+        yield session
@@ -34,6 +34,7 @@ class User(SQLModel, table=True):
     badges: List[str] = Field(default_factory=list, sa_column=Column(pg.ARRAY(String)))
     avatar_url: Optional[str] = Field(default=None)
     is_verified: bool = Field(default=False, nullable=False)
+    token_version: int = Field(default=0, nullable=False)
     productivity: float = Field(default=0.0, nullable=False)
     average_task_time: float = Field(default=0.0, nullable=False)
 
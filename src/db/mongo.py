@@ -1,11 +1,28 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from src.config import Config
 from datetime import datetime, timedelta
+from src.cache import TTLCache
+import logging
+import time
+
+logger = logging.getLogger(__name__)
 
 JTI_EXPIRY = 3600
 
+UNREVOKED_CACHE_SIZE = 50_000
+UNREVOKED_CACHE_TTL = 30
+
+# JTIs recently confirmed absent from the blocklist. Revocations made by this
+# process drop the entry immediately; those made by other workers are seen
+# within UNREVOKED_CACHE_TTL.
+unrevoked_jti_cache = TTLCache(UNREVOKED_CACHE_SIZE)
+
+mongo_client = None
+blocklist_collection = None
+
 async def get_mongo_client():
-    mongo_client = await initialize_mongo()
+    if mongo_client is None:
+        await initialize_mongo()
     return mongo_client
 
 # Initialize MongoDB connection
@@ -17,45 +34,59 @@ async def initialize_mongo():
         db = mongo_client[Config.MONGO_DB_NAME]
         blocklist_collection = db["token_blocklist"]
         await mongo_client.admin.command('ping')
-        print("Successfully connected to MongoDB")
+        logger.info("Successfully connected to MongoDB")
         await create_ttl_index()  # Create TTL index
     except Exception as e:
-        print(f"Error connecting to MongoDB: {e}")
+        logger.error("Error connecting to MongoDB: %s", e)
         raise
 
+
+async def close_mongo():
+    global mongo_client, blocklist_collection
+    if mongo_client is not None:
+        mongo_client.close()
+        mongo_client = None
+        blocklist_collection = None
         
         
 # Add a JTI to the blocklist
 async def add_jti_to_blocklist(jti: str) -> None:
+    unrevoked_jti_cache.pop(jti)
     try:
         expiry_time = datetime.utcnow() + timedelta(seconds=JTI_EXPIRY)
         await blocklist_collection.insert_one({
             "jti": jti,
             "expiry": expiry_time
         })
-        print(f"Added {jti} to blocklist with expiry at {expiry_time}")
+        logger.debug("Added %s to blocklist with expiry at %s", jti, expiry_time)
     except Exception as e:
-        print(f"Error adding to blocklist: {e}")
+        logger.error("Error adding to blocklist: %s", e)
 
 # Check if a JTI is in the blocklist
 async def token_in_blocklist(jti: str) -> bool:
+    if unrevoked_jti_cache.get(jti):
+        return False
+
     try:
         # Find the token and ensure it hasn't expired
         token = await blocklist_collection.find_one({
             "jti": jti,
             "expiry": {"$gt": datetime.utcnow()}  # Check if expiry time is in the future
         })
-        return token is not None
+        if token is not None:
+            return True
+        unrevoked_jti_cache.set(jti, True, time.time() + UNREVOKED_CACHE_TTL)
+        return False
     except Exception as e:
-        print(f"Error checking blocklist: {e}")
+        logger.error("Error checking blocklist: %s", e)
         return False
 
 async def create_ttl_index():
     try:
         await blocklist_collection.create_index("expiry", expireAfterSeconds=0)
-        print("TTL index created on 'expiry' field")
+        logger.info("TTL index created on 'expiry' field")
     except Exception as e:
-        print(f"Error creating TTL index: {e}")
+        logger.error("Error creating TTL index: %s", e)
 
 # Cleanup expired tokens (optional, can be run periodically)
 async def cleanup_expired_tokens():
@@ -63,6 +94,6 @@ async def cleanup_expired_tokens():
         result = await blocklist_collection.delete_many({
             "expiry": {"$lte": datetime.utcnow()}  # Delete tokens with expiry in the past
         })
-        print(f"Cleaned up {result.deleted_count} expired tokens")
+        logger.info("Cleaned up %s expired tokens", result.deleted_count)
     except Exception as e:
-        print(f"Error cleaning up expired tokens: {e}")
\ No newline at end of file
+        logger.error("Error cleaning up expired tokens: %s", e)
\ No newline at end of file
@@ -0,0 +1,18 @@
+from fastapi import FastAPI, status
+from fastapi.requests import Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import SQLAlchemyError
+import logging
+
+logger = logging.getLogger(__name__)
+
+def register_error_handlers(app: FastAPI):
+    
+    @app.exception_handler(SQLAlchemyError)
+    async def database_error_handler(request: Request, exc: SQLAlchemyError):
+        logger.exception("Database error on %s %s", request.method, request.url.path)
+        
+        return JSONResponse(
+            content={"message": "Oops! Something went wrong"},
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
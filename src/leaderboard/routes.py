@@ -40,7 +40,7 @@ def update_leaderboard_entry(leaderboard_id: UUID, leaderboard_update: Leaderboa
         raise HTTPException(status_code=404, detail="Leaderboard entry not found")
     if leaderboard_entry.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to update this leaderboard entry")
-    for key, value in leaderboard_update.dict().items():
+    for key, value in leaderboard_update.model_dump().items():
         setattr(leaderboard_entry, key, value)
     session.commit()
     session.refresh(leaderboard_entry)
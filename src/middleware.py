@@ -5,20 +5,21 @@ from fastapi.middleware.trustedhost import TrustedHostMiddleware
 import time
 import logging
 
-logger = logging.getLogger("uvicorn.access")
-logger.disabled = False
+logger = logging.getLogger(__name__)
 
 def register_middleware(app:FastAPI):
     
     @app.middleware("http")
     async def custom_logging(request:Request, call_next):
-        start_time = time.time()
-        print("Before", start_time)
+        start_time = time.perf_counter()
         
         response = await call_next(request)
-        processing_time = time.time() - start_time
-        message = f"{request.client.host}:{request.client.port} - {request.method} - {request.url.path} - {response.status_code} completed after {processing_time}s"
-        print(message)
+        processing_time = time.perf_counter() - start_time
+        logger.info(
+            "%s:%s - %s - %s - %s completed after %ss",
+            request.client.host, request.client.port, request.method,
+            request.url.path, response.status_code, processing_time
+        )
         
         return response
     
@@ -81,7 +81,7 @@ async def update_task(
                 detail="Not authorized to add tasks to this workroom."
             )
 
-    for key, value in task_update.dict(exclude_unset=True).items():
+    for key, value in task_update.model_dump(exclude_unset=True).items():
         setattr(task, key, value)
     await session.commit()
     await session.refresh(task)
@@ -96,7 +96,6 @@ async def delete_task(task_id: UUID, session: AsyncSession = Depends(get_session
     if task.created_by_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this task")
     await session.delete(task)
-    await session.flush()
     await session.commit()
     return {"message": "Task deleted successfully"}
 
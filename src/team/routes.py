@@ -40,7 +40,7 @@ def update_team(team_id: UUID, team_update: Team, session: AsyncSession = Depend
         raise HTTPException(status_code=404, detail="Team not found")
     if team.created_by != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to update this team")
-    for key, value in team_update.dict().items():
+    for key, value in team_update.model_dump().items():
         setattr(team, key, value)
     session.commit()
     session.refresh(team)
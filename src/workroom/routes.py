@@ -3,8 +3,8 @@ from sqlmodel import select
 from src.db.main import get_session
 from sqlmodel.ext.asyncio.session import AsyncSession
 from src.tasks.schema import TaskCreate
-from .schema import WorkroomCreate, WorkroomUpdate
-from typing import List, Optional, Dict, Any
+from .schema import WorkroomCreate, WorkroomUpdate, LeaderboardEntry
+from typing import List, Optional
 from uuid import UUID
 from src.db.models import Workroom, User, Task, Leaderboard, TaskStatus
 from src.auth.dependencies import get_current_user
@@ -61,7 +61,7 @@ async def update_workroom(
     if workroom.created_by != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to update this workroom")
 
-    for key, value in workroom_update.dict(exclude_unset=True).items():
+    for key, value in workroom_update.model_dump(exclude_unset=True).items():
         setattr(workroom, key, value)
     await session.commit()
     await session.refresh(workroom)
@@ -79,7 +79,6 @@ async def delete_workroom(
     if workroom.created_by != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this workroom")
     await session.delete(workroom)
-    await session.flush()
     await session.commit()
     return {"message": "Workroom deleted successfully"}
 
@@ -98,8 +97,11 @@ async def add_members_to_workroom(
     if workroom.created_by != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to add members to this workroom")
 
+    result = await session.exec(select(User).where(User.id.in_(user_ids)))
+    users = {user.id: user for user in result.all()}
+
     for user_id in user_ids:
-        user = await session.get(User, user_id)
+        user = users.get(user_id)
         if not user:
             raise HTTPException(status_code=404, detail=f"User with ID {user_id} not found")
         workroom.members.append(user)
@@ -162,9 +164,9 @@ async def bulk_remove_members_from_workroom(
     if workroom.created_by != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to remove members from this workroom")
 
-    for user_id in user_ids:
-        user = await session.get(User, user_id)
-        if user and user in workroom.members:
+    result = await session.exec(select(User).where(User.id.in_(user_ids)))
+    for user in result.all():
+        if user in workroom.members:
             workroom.members.remove(user)
 
     await session.commit()
@@ -227,7 +229,7 @@ async def create_task_in_workroom(
 
 # Leaderboard Management (Related to Workrooms)
 
-@workroom_router.get("/{workroom_id}/leaderboard", response_model=List[Dict[str, Any]])
+@workroom_router.get("/{workroom_id}/leaderboard", response_model=List[LeaderboardEntry])
 async def get_workroom_leaderboard(
     workroom_id: UUID,
     session: AsyncSession = Depends(get_session),
@@ -241,21 +243,17 @@ async def get_workroom_leaderboard(
 
 
     leaderboard_entries = await session.exec(
-        select(Leaderboard, User)
-        .join(User)
+        select(
+            User.id.label("user_id"),
+            User.username,
+            Leaderboard.score,
+            Leaderboard.rank,
+            User.avatar_url,
+            User.first_name,
+            User.last_name,
+        )
+        .join(User, User.id == Leaderboard.user_id)
         .where(Leaderboard.workroom_id == workroom_id)
     )
 
-    leaderboard_data: List[Dict[str, Any]] = []
-    for leaderboard, user in leaderboard_entries:
-        leaderboard_data.append({
-            "user_id": user.id,
-            "username": user.username,
-            "score": leaderboard.score,
-            "rank": leaderboard.rank,
-            "avatar_url": user.avatar_url,
-            "first_name": user.first_name,
-            "last_name": user.last_name
-            # ... other user details you want to include
-        })
-    return leaderboard_data
+    return [LeaderboardEntry.model_validate(entry, from_attributes=True) for entry in leaderboard_entries]
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import Optional
+from uuid import UUID
 
 
 class WorkroomCreate(BaseModel):
@@ -8,4 +9,13 @@ class WorkroomCreate(BaseModel):
 
 class WorkroomUpdate(BaseModel):
     name: Optional[str] = Field(None, min_length=1)
-    description: Optional[str] = None
\ No newline at end of file
+    description: Optional[str] = None
+
+class LeaderboardEntry(BaseModel):
+    user_id: UUID
+    username: Optional[str] = None
+    score: int
+    rank: Optional[int] = None
+    avatar_url: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None